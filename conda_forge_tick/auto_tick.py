@@ -1278,10 +1278,10 @@ def _run_migrator(migrator, mctx, temp, time_per, dry_run):
                                 with attrs["pr_info"] as pri:
                                     d = frozen_to_json_friendly(migrator_uid)
                                     # if we have the PR already do nothing
-                                    if d["data"] in [
-                                        existing_pr["data"]
+                                    if any(
+                                        existing_pr["data"] == d["data"]
                                         for existing_pr in pri.get("PRed", [])
-                                    ]:
+                                    ):
                                         pass
                                     else:
                                         if not pr_json:
@@ -67,6 +67,22 @@ def get_sharded_path(file_path, n_dirs=CF_TICK_GRAPH_GITHUB_BACKEND_NUM_DIRS):
         return os.path.join(*pth_parts)
 
 
+def _iter_json_files(root: str) -> Iterator[str]:
+    """Recursively yield the paths of the non-hidden json files under root."""
+    if not os.path.isdir(root):
+        return
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".json"):
+                    yield entry.path
+
+
 class LazyJsonBackend(ABC):
     @contextlib.contextmanager
     @abstractmethod
@@ -172,6 +188,7 @@ class FileLazyJsonBackend(LazyJsonBackend):
 
     def hkeys(self, name: str) -> List[str]:
         jlen = len(".json")
+        fnames: Iterable[str]
         if name == "lazy_json":
             fnames = glob.glob("*.json")
             fnames = set(fnames) - {
@@ -179,7 +196,7 @@ class FileLazyJsonBackend(LazyJsonBackend):
                 "all_feedstocks.json",
             }
         else:
-            fnames = glob.glob(os.path.join(name, "**/*.json"), recursive=True)
+            fnames = _iter_json_files(name)
         return [os.path.basename(fname)[:-jlen] for fname in fnames]
 
     def hget(self, name: str, key: str) -> str:
@@ -749,30 +766,36 @@ class LazyJson(MutableMapping):
         assert self._data is not None
         del self._data[v]
 
-    def _load(self) -> None:
-        if self._data is None:
-            file_backend = LAZY_JSON_BACKENDS["file"]()
-
-            # check if we have it in the cache first
-            # if yes, load it from cache, if not load from primary backend and cache it
-            if CF_TICK_GRAPH_DATA_USE_FILE_CACHE and file_backend.hexists(
-                self.hashmap, self.node
+    def load_data_str(self) -> str:
+        """Get the raw JSON string of the data from the backends without
+        decoding it. The string is in the format written by ``dumps``."""
+        file_backend = LAZY_JSON_BACKENDS["file"]()
+
+        # check if we have it in the cache first
+        # if yes, load it from cache, if not load from primary backend and cache it
+        if CF_TICK_GRAPH_DATA_USE_FILE_CACHE and file_backend.hexists(
+            self.hashmap, self.node
+        ):
+            data_str = file_backend.hget(self.hashmap, self.node)
+        else:
+            backend = LAZY_JSON_BACKENDS[CF_TICK_GRAPH_DATA_PRIMARY_BACKEND]()
+            backend.hsetnx(self.hashmap, self.node, dumps({}))
+            data_str = backend.hget(self.hashmap, self.node)
+            if isinstance(data_str, bytes):
+                data_str = data_str.decode("utf-8")
+
+            # cache it locally for later
+            if (
+                CF_TICK_GRAPH_DATA_USE_FILE_CACHE
+                and CF_TICK_GRAPH_DATA_PRIMARY_BACKEND != "file"
             ):
-                data_str = file_backend.hget(self.hashmap, self.node)
-            else:
-                backend = LAZY_JSON_BACKENDS[CF_TICK_GRAPH_DATA_PRIMARY_BACKEND]()
-                backend.hsetnx(self.hashmap, self.node, dumps({}))
-                data_str = backend.hget(self.hashmap, self.node)
-                if isinstance(data_str, bytes):
-                    data_str = data_str.decode("utf-8")
+                file_backend.hset(self.hashmap, self.node, data_str)
 
-                # cache it locally for later
-                if (
-                    CF_TICK_GRAPH_DATA_USE_FILE_CACHE
-                    and CF_TICK_GRAPH_DATA_PRIMARY_BACKEND != "file"
-                ):
-                    file_backend.hset(self.hashmap, self.node, data_str)
+        return data_str
 
+    def _load(self) -> None:
+        if self._data is None:
+            data_str = self.load_data_str()
             self._data_hash_at_load = hashlib.sha256(
                 data_str.encode("utf-8"),
             ).hexdigest()
@@ -886,9 +909,12 @@ def dump(
 
 
 def loads(
-    s: str, object_hook: "Callable[[dict], Any]" = object_hook, **kwargs: Any
+    s: Union[str, bytes],
+    object_hook: "Callable[[dict], Any]" = object_hook,
+    **kwargs: Any,
 ) -> dict:
-    """Loads a string as JSON, with appropriate object hooks"""
+    """Loads a string (or UTF-8 encoded bytes) as JSON, with appropriate
+    object hooks"""
     return json.loads(s, object_hook=object_hook, **kwargs)
 
 
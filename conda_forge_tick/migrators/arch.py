@@ -6,7 +6,7 @@ import networkx as nx
 
 from conda_forge_tick.contexts import FeedstockContext
 from conda_forge_tick.make_graph import get_deps_from_outputs_lut
-from conda_forge_tick.migrators.core import GraphMigrator, _sanitized_muids
+from conda_forge_tick.migrators.core import GraphMigrator, muid_in_pred
 from conda_forge_tick.os_utils import pushd
 from conda_forge_tick.utils import (
     as_iterable,
@@ -154,9 +154,7 @@ class ArchRebuild(GraphMigrator):
                 attrs.get("conda-forge.yml", {}).get("provider", {}).get(arch)
             )
             if configured_arch:
-                return muid in _sanitized_muids(
-                    attrs.get("pr_info", {}).get("PRed", []),
-                )
+                return muid_in_pred(attrs, muid)
         else:
             return False
 
@@ -292,9 +290,7 @@ class OSXArm(GraphMigrator):
                 attrs.get("conda-forge.yml", {}).get("provider", {}).get(arch)
             )
             if configured_arch:
-                return muid in _sanitized_muids(
-                    attrs.get("pr_info", {}).get("PRed", []),
-                )
+                return muid_in_pred(attrs, muid)
         else:
             return False
 
@@ -5,13 +5,26 @@ import logging
 import os
 import re
 import typing
-from itertools import chain
-from typing import Any, List, Optional, Sequence, Set
+from itertools import chain, islice
+from types import MappingProxyType
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+)
 
 import dateutil.parser
 import networkx as nx
 
 from conda_forge_tick.contexts import FeedstockContext, MigratorContext
+from conda_forge_tick.executors import executor
 from conda_forge_tick.lazy_json_backends import LazyJson
 from conda_forge_tick.make_graph import make_outputs_lut_from_graph
 from conda_forge_tick.path_lengths import cyclic_topological_sort
@@ -30,18 +43,42 @@ if typing.TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# immutable defaults for the lookups on the hot filter path so that we
+# do not allocate a new empty dict/tuple for every node
+_EMPTY_DICT: Mapping = MappingProxyType({})
+_EMPTY_TUPLE: tuple = ()
+
+
+def _pred_index(pred: Sequence[dict], muid: "JsonFriendly") -> Optional[int]:
+    """Get the index of the first entry of ``PRed`` matching the migrator uid
+    ``muid`` (as returned by ``frozen_to_json_friendly``), or None."""
+    data = muid["data"]
+    keys = muid["keys"]
+    return next(
+        (i for i, z in enumerate(pred) if z["data"] == data and z["keys"] == keys),
+        None,
+    )
+
+
+def muid_in_pred(attrs: "AttrsTypedDict", muid: "JsonFriendly") -> bool:
+    """Check whether the migrator uid ``muid`` (as returned by
+    ``frozen_to_json_friendly``) has an entry in the ``PRed`` of a node."""
+    pred = attrs.get("pr_info", _EMPTY_DICT).get("PRed", _EMPTY_TUPLE)
+    return _pred_index(pred, muid) is not None
 
-def _sanitized_muids(pred: List[dict]) -> List["JsonFriendly"]:
-    lst = []
-    for pr in pred:
-        d: "JsonFriendly" = {"data": pr["data"], "keys": pr["keys"]}
-        lst.append(d)
-    return lst
+
+def _parse_pr_timestamp(ts: str) -> datetime.datetime:
+    # GitHub timestamps are ISO 8601 which the stdlib parses much faster
+    # than dateutil, so only fall back to dateutil for anything else
+    try:
+        return datetime.datetime.fromisoformat(ts)
+    except ValueError:
+        return dateutil.parser.parse(ts)
 
 
 def _parse_bad_attr(attrs: "AttrsTypedDict", not_bad_str_start: str) -> bool:
     """Overlook some bad entries"""
-    bad = attrs.get("pr_info", {}).get("bad", False)
+    bad = attrs.get("pr_info", _EMPTY_DICT).get("bad", False)
     if isinstance(bad, str):
         bad_bool = not bad.startswith(not_bad_str_start)
     else:
@@ -151,10 +188,11 @@ class Migrator:
         """Utility method for getting a list of follow on packages"""
         return [
             a[1]
-            for a in list(
+            for a in islice(
                 self.ctx.effective_graph.out_edges(feedstock_ctx.package_name),
+                limit,
             )
-        ][:limit]
+        ]
 
     def filter(self, attrs: "AttrsTypedDict", not_bad_str_start: str = "") -> bool:
         """If true don't act upon node
@@ -185,21 +223,20 @@ class Migrator:
                 "MigrationUidTypedDict",
                 pr_data["data"],
             )
-            already_migrated_uids: typing.Iterable["MigrationUidTypedDict"] = list(
-                z["data"] for z in attrs.get("pr_info", {}).get("PRed", [])
+            pred = attrs.get("pr_info", _EMPTY_DICT).get("PRed", _EMPTY_TUPLE)
+            ind = next(
+                (i for i, z in enumerate(pred) if z["data"] == migrator_uid), None
             )
-            already_pred = migrator_uid in already_migrated_uids
-            if already_pred:
-                ind = already_migrated_uids.index(migrator_uid)
+            already_pred = ind is not None
+            # the PR json is only opened to log where it lives, so skip
+            # loading it when debug logging is off
+            if already_pred and logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"{__name}: already PRed: uid: {migrator_uid}")
-                if "PR" in attrs.get("pr_info", {}).get("PRed", [])[ind]:
-                    if isinstance(
-                        attrs.get("pr_info", {}).get("PRed", [])[ind]["PR"],
-                        LazyJson,
-                    ):
-                        with attrs.get("pr_info", {}).get("PRed", [])[ind][
-                            "PR"
-                        ] as mg_attrs:
+                pred_entry = pred[ind]
+                if "PR" in pred_entry:
+                    pr_obj = pred_entry["PR"]
+                    if isinstance(pr_obj, LazyJson):
+                        with pr_obj as mg_attrs:
                             logger.debug(
                                 "{}: already PRed: PR file: {}".format(
                                     __name, mg_attrs.file_name
@@ -402,12 +439,9 @@ class Migrator:
         -------
 
         """
-        top_level = {
-            node
-            for node in graph
-            if not list(graph.predecessors(node))
-            or list(graph.predecessors(node)) == [node]
-        }
+        # nodes with no predecessors or whose only predecessor is themselves
+        not_top_level = {v for u, v in graph.edges if u != v}
+        top_level = set(graph.nodes) - not_top_level
         return cyclic_topological_sort(graph, top_level)
 
     def set_build_number(self, filename: str) -> None:
@@ -421,15 +455,30 @@ class Migrator:
         with open(filename) as f:
             raw = f.read()
 
-        new_myaml = update_build_number(
+        new_myaml = self._set_build_number_in_text(raw)
+
+        with open(filename, "w") as f:
+            f.write(new_myaml)
+
+    def _set_build_number_in_text(self, raw: str) -> str:
+        """Bump the build number in the text of a meta.yaml.
+
+        Parameters
+        ----------
+        raw : str
+            The meta.yaml as a string.
+
+        Returns
+        -------
+        new_myaml : str
+            The meta.yaml with the build number bumped.
+        """
+        return update_build_number(
             raw,
             self.new_build_number,
             build_patterns=self.build_patterns,
         )
 
-        with open(filename, "w") as f:
-            f.write(new_myaml)
-
     def new_build_number(self, old_number: int) -> int:
         """Determine the new build number to use.
 
@@ -456,6 +505,9 @@ class Migrator:
 
 
 class GraphMigrator(Migrator):
+    # open PRs of predecessors younger than this block the pinning migration
+    pr_stale_age = datetime.timedelta(days=14)
+
     def __init__(
         self,
         *,
@@ -488,25 +540,53 @@ class GraphMigrator(Migrator):
             self.outputs_lut = make_outputs_lut_from_graph(self.graph)
 
         self.name = name
-        self.top_level = top_level or set()
-        self.cycles = set(chain.from_iterable(cycles or []))
+        self.top_level = frozenset(top_level or ())
+        self.cycles = frozenset(chain.from_iterable(cycles or ()))
         self.ignored_deps_per_node = ignored_deps_per_node or {}
+        self._muid_cache: Dict[Hashable, "JsonFriendly"] = {}
+        self._ignored_deps_cache: Dict[Optional[str], FrozenSet["PackageName"]] = {}
+
+    def bind_to_ctx(self, migrator_ctx: MigratorContext) -> None:
+        self._muid_cache.clear()
+        super().bind_to_ctx(migrator_ctx)
+
+    def _cached_frozen_muid(self, payload: "AttrsTypedDict") -> "JsonFriendly":
+        """Get the frozen migrator uid for a node.
+
+        The uid of a graph migration only depends on the branch of the node,
+        so we cache it per branch.
+        """
+        branch = payload.get("branch", "main")
+        cached = self._muid_cache.get(branch)
+        if cached is None:
+            cached = frozen_to_json_friendly(self.migrator_uid(payload))
+            self._muid_cache[branch] = cached
+        return cached
+
+    def _ignored_deps(self, attrs: "AttrsTypedDict") -> FrozenSet["PackageName"]:
+        """Get the dependencies ignored for a node as a set."""
+        feedstock_name = attrs.get("feedstock_name", None)
+        ignored = self._ignored_deps_cache.get(feedstock_name)
+        if ignored is None:
+            ignored = frozenset(self.ignored_deps_per_node.get(feedstock_name, ()))
+            self._ignored_deps_cache[feedstock_name] = ignored
+        return ignored
 
     def all_predecessors_issued_and_stale(self, attrs: "AttrsTypedDict") -> bool:
         # Check if all upstreams have been issue and are stale
+        ignored_deps = self._ignored_deps(attrs)
+        issued = []
         for node, payload in _gen_active_feedstocks_payloads(
             self.graph.predecessors(attrs["feedstock_name"]),
             self.graph,
         ):
-            if node in self.ignored_deps_per_node.get(
-                attrs.get("feedstock_name", None),
-                [],
-            ):
+            if node in ignored_deps:
                 continue
 
-            muid = frozen_to_json_friendly(self.migrator_uid(payload))
-            pr_muids = _sanitized_muids(payload.get("pr_info", {}).get("PRed", []))
-            if muid not in pr_muids:
+            muid = self._cached_frozen_muid(payload)
+            pred = payload.get("pr_info", _EMPTY_DICT).get("PRed", _EMPTY_TUPLE)
+            pr_index = _pred_index(pred, muid)
+            if pr_index is None:
                 logger.debug(
                     "node %s PR %s not yet issued!",
                     node,
@@ -514,73 +594,67 @@ class GraphMigrator(Migrator):
                 )
                 # not yet issued
                 return False
-            else:
-                # issued so check timestamp
-                pr_index = pr_muids.index(muid)
-                ts = (
-                    payload.get("pr_info", {})
-                    .get("PRed", [])[pr_index]
-                    .get("PR", {})
-                    .get("created_at", None)
-                )
-                state = (
-                    payload.get("pr_info", {})
-                    .get("PRed", [])[pr_index]
-                    .get("PR", {"state": "open"})
-                    .get("state", "")
-                )
-                if state == "open":
-                    if ts is not None:
-                        now = datetime.datetime.now(datetime.timezone.utc)
-                        ts = dateutil.parser.parse(ts)
-                        if now - ts < datetime.timedelta(days=14):
-                            logger.debug(
-                                "node %s has PR %s open for %s",
-                                node,
-                                muid.get("data", {}).get("name", None),
-                                now - ts,
-                            )
-                            return False
-                    else:
-                        # no timestamp so keep things open
+            issued.append((node, muid, pred[pr_index]))
+
+        # all issued so load the PR jsons concurrently before checking timestamps
+        prs = [
+            pred_entry["PR"]
+            for _, _, pred_entry in issued
+            if isinstance(pred_entry.get("PR", None), LazyJson)
+        ]
+        if len(prs) > 1:
+            with executor("thread", max_workers=8) as pool:
+                for _ in pool.map(lambda pr: pr.data, prs):
+                    pass
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        for node, muid, pred_entry in issued:
+            pr_obj = pred_entry.get("PR", {"state": "open"})
+            ts = pr_obj.get("created_at", None)
+            state = pr_obj.get("state", "")
+            if state == "open":
+                if ts is not None:
+                    ts = _parse_pr_timestamp(ts)
+                    if now - ts < self.pr_stale_age:
                         logger.debug(
-                            "node %s has PR %s:%s with no timestamp",
+                            "node %s has PR %s open for %s",
                             node,
                             muid.get("data", {}).get("name", None),
-                            payload.get("pr_info", {})
-                            .get("PRed", [])[pr_index]["PR"]
-                            .file_name,
+                            now - ts,
                         )
                         return False
+                else:
+                    # no timestamp so keep things open
+                    logger.debug(
+                        "node %s has PR %s:%s with no timestamp",
+                        node,
+                        muid.get("data", {}).get("name", None),
+                        pred_entry["PR"].file_name,
+                    )
+                    return False
 
         return True
 
     def predecessors_not_yet_built(self, attrs: "AttrsTypedDict") -> bool:
         # Check if all upstreams have been built
+        ignored_deps = self._ignored_deps(attrs)
         for node, payload in _gen_active_feedstocks_payloads(
             self.graph.predecessors(attrs["feedstock_name"]),
             self.graph,
         ):
-            if node in self.ignored_deps_per_node.get(
-                attrs.get("feedstock_name", None),
-                [],
-            ):
+            if node in ignored_deps:
                 continue
 
-            muid = frozen_to_json_friendly(self.migrator_uid(payload))
+            muid = self._cached_frozen_muid(payload)
+            pred = payload.get("pr_info", _EMPTY_DICT).get("PRed", _EMPTY_TUPLE)
 
-            if muid not in _sanitized_muids(
-                payload.get("pr_info", {}).get("PRed", []),
-            ):
+            pr_index = _pred_index(pred, muid)
+            if pr_index is None:
                 logger.debug("not yet built: %s" % node)
                 return True
 
             # This is due to some PRed_json loss due to bad graph deploy outage
-            for m_pred_json in payload.get("pr_info", {}).get("PRed", []):
-                if m_pred_json["data"] == muid["data"]:
-                    break
-            else:
-                m_pred_json = None
+            m_pred_json = pred[pr_index]
 
             # note that if the bot is missing the PR we assume it is open
             # so that errors halt the migration and can be fixed
@@ -630,6 +704,19 @@ class GraphMigrator(Migrator):
         return n
 
 
+def _replacement_pattern(packages: Iterable[str]) -> "re.Pattern[str]":
+    """Compile a pattern matching the requirement lines of any of the packages,
+    with the package name as its first group."""
+    # match whole requirement lines (without crossing line boundaries),
+    # trying longer names first so that a package is not shadowed by
+    # one of its prefixes
+    alt = "|".join(re.escape(pkg) for pkg in sorted(packages, key=len, reverse=True))
+    return re.compile(
+        r"^[^\S\n]*-[^\S\n]*(%s)(?:[^\S\n].*)?$" % alt,
+        re.MULTILINE,
+    )
+
+
 class Replacement(Migrator):
     """Migrator for replacing one package with another.
 
@@ -665,8 +752,9 @@ class Replacement(Migrator):
         super().__init__(pr_limit, check_solvable=check_solvable)
         self.old_pkg = old_pkg
         self.new_pkg = new_pkg
-        self.pattern = re.compile(r"\s*-\s*(%s)(\s+|$)" % old_pkg)
-        self.packages = {old_pkg}
+        self.replacements: Dict[str, str] = {old_pkg: new_pkg}
+        self.packages = set(self.replacements)
+        self.pattern = _replacement_pattern(self.packages)
         self.rationale = rationale
         self.name = f"{old_pkg}-to-{new_pkg}"
         if graph is None:
@@ -695,32 +783,26 @@ class Replacement(Migrator):
 
     def filter(self, attrs: "AttrsTypedDict", not_bad_str_start: str = "") -> bool:
         requirements = attrs.get("requirements", {})
-        rq = (
-            requirements.get("build", set())
-            | requirements.get("host", set())
-            | requirements.get("run", set())
-            | requirements.get("test", set())
+        has_pkg = any(
+            not self.packages.isdisjoint(requirements.get(section, ()))
+            for section in ("build", "host", "run", "test")
         )
-        return super().filter(attrs) or len(rq & self.packages) == 0
+        return super().filter(attrs) or not has_pkg
 
     def migrate(
         self, recipe_dir: str, attrs: "AttrsTypedDict", **kwargs: Any
     ) -> "MigrationUidTypedDict":
         with open(os.path.join(recipe_dir, "meta.yaml")) as f:
             raw = f.read()
-        lines = raw.splitlines()
-        n = False
-        for i, line in enumerate(lines):
-            m = self.pattern.match(line)
-            if m is not None:
-                lines[i] = lines[i].replace(m.group(1), self.new_pkg)
-                n = True
+        upd, n = self.pattern.subn(
+            lambda m: m.group(0).replace(m.group(1), self.replacements[m.group(1)]),
+            raw,
+        )
         if not n:
             return False
-        upd = "\n".join(lines) + "\n"
+        upd = self._set_build_number_in_text(upd)
         with open(os.path.join(recipe_dir, "meta.yaml"), "w") as f:
             f.write(upd)
-        self.set_build_number(os.path.join(recipe_dir, "meta.yaml"))
         return super().migrate(recipe_dir, attrs)
 
     def pr_body(self, feedstock_ctx: FeedstockContext) -> str:
@@ -149,27 +149,23 @@ class MigrationYaml(GraphMigrator):
         self.yaml_contents = yaml_contents
         assert isinstance(name, str)
         self.name = name
-        self.top_level = top_level or set()
-        self.cycles = set(chain.from_iterable(cycles or []))
+        self.top_level = frozenset(top_level or ())
+        self.cycles = frozenset(chain.from_iterable(cycles or ()))
         self.automerge = automerge
         self.conda_forge_yml_patches = conda_forge_yml_patches
         self.loaded_yaml = yaml_safe_load(self.yaml_contents)
 
         # auto set the pr_limit for initial things
         if self.pr_limit > 2:
-            number_pred = len(
-                [
-                    k
-                    for k, v in self.graph.nodes.items()
-                    if self.migrator_uid(v.get("payload", {}))
-                    in [
-                        vv.get("data", {})
-                        for vv in v.get("payload", {})
-                        .get("pr_info", {})
-                        .get("PRed", [])
-                    ]
-                ],
-            )
+            number_pred = 0
+            for v in self.graph.nodes.values():
+                payload = v.get("payload", {})
+                muid = self.migrator_uid(payload)
+                if any(
+                    vv.get("data", {}) == muid
+                    for vv in payload.get("pr_info", {}).get("PRed", [])
+                ):
+                    number_pred += 1
             if number_pred == 0:
                 self.pr_limit = 2
             elif number_pred < 7:
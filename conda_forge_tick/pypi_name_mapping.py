@@ -6,20 +6,23 @@ Builds and maintains mapping of pypi-names to conda-forge names
 """
 
 import functools
+import hashlib
 import json
-import math
 import os
 import pathlib
+import re
+import tempfile
 import traceback
-from collections import Counter, defaultdict
-from os.path import commonprefix
-from typing import Any, Dict, List, Literal, Optional, Set, Tuple, TypedDict, Union
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, TypedDict
 
+import numpy as np
 import requests
 import yaml
 from packaging.utils import NormalizedName as PypiName
 from packaging.utils import canonicalize_name as canonicalize_pypi_name
 
+from .executors import executor
 from .import_to_pkg import IMPORT_TO_PKG_DIR_CLOBBERING
 from .lazy_json_backends import (
     CF_TICK_GRAPH_DATA_BACKENDS,
@@ -31,6 +34,19 @@ from .lazy_json_backends import (
 )
 from .utils import as_iterable, load_existing_graph
 
+if TYPE_CHECKING:
+    import networkx
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+
+# reused for all HTTP requests made by this module
+_SESSION = requests.Session()
+
 
 class Mapping(TypedDict):
     pypi_name: PypiName
@@ -39,8 +55,17 @@ class Mapping(TypedDict):
     mapping_source: str
 
 
+# a top-level "archived": true entry in the indented JSON written by dumps
+_ARCHIVED_RE = re.compile(r'^ "archived": ?true,?$', re.MULTILINE)
+
+
 def load_node_meta_yaml(node: str) -> Optional[Dict[str, str]]:
-    node_attr = LazyJson(f"node_attrs/{node}.json")
+    data_str = LazyJson(f"node_attrs/{node}.json").load_data_str()
+    # skip decoding the JSON of archived feedstocks, anything the regex
+    # misses is still caught by the check on the decoded attrs below
+    if _ARCHIVED_RE.search(data_str):
+        return None
+    node_attr = loads(data_str)
     if node_attr.get("archived", False):
         return None
     meta_yaml = node_attr.get("meta_yaml", None)
@@ -56,6 +81,9 @@ def extract_pypi_name_from_metadata_extras(
     return None
 
 
+_PYPI_URL_RE = re.compile(r"https://pypi\.(?:io|org|python\.org)/packages/")
+
+
 def extract_pypi_name_from_metadata_source_url(
     meta_yaml: Dict[str, Any],
 ) -> Optional[PypiName]:
@@ -64,12 +92,8 @@ def extract_pypi_name_from_metadata_source_url(
             src_urls = meta_yaml["source"]["url"]
             src_urls = as_iterable(src_urls)
             for url in src_urls:
-                if (
-                    url.startswith("https://pypi.io/packages/")
-                    or url.startswith("https://pypi.org/packages/")
-                    or url.startswith("https://pypi.python.org/packages/")
-                ):
-                    return canonicalize_pypi_name(url.split("/")[-2])
+                if _PYPI_URL_RE.match(url):
+                    return canonicalize_pypi_name(url.rsplit("/", 2)[-2])
     return None
 
 
@@ -101,12 +125,13 @@ _KNOWN_NAMESPACE_PACKAGES: List[str] = [
 KNOWN_NAMESPACE_PACKAGES: Set[Tuple[str, ...]] = {
     tuple(imp.split(".")) for imp in _KNOWN_NAMESPACE_PACKAGES
 }
+# top-level names of the known namespace packages, for a cheap first check
+_NS_HEADS: Set[str] = {ns[0] for ns in KNOWN_NAMESPACE_PACKAGES}
 
 
 def _imports_to_canonical_import(
     split_imports: Set[Tuple[str, ...]],
-    parent_prefix=(),
-) -> Union[Tuple[str, ...], Literal[""]]:
+) -> Tuple[str, ...]:
     """Extract the canonical import name from a list of imports
 
     We have two rules.
@@ -119,24 +144,48 @@ def _imports_to_canonical_import(
         you are also treated as a namespace package
     3. Otherwise return the commonprefix
 
+    The imports are put in a trie whose nodes are ``[children, is_import]``
+    and the canonical import is found by walking down it once.
     """
-    prefix: Union[Tuple[str, ...], Literal[""]] = commonprefix(list(split_imports))  # type: ignore
-    c = Counter(len(imp) for imp in split_imports)
-    if (
-        len(prefix) == 1
-        and c.get(1) == 1
-        and (
-            (len(split_imports) > 3)
-            or (parent_prefix + prefix in KNOWN_NAMESPACE_PACKAGES)
-        )
-    ):
-        ns_prefix = _imports_to_canonical_import(
-            split_imports={imp[1:] for imp in split_imports if len(imp) > 1},
-            parent_prefix=parent_prefix + prefix,
-        )
-        if prefix and ns_prefix:
-            return prefix + ns_prefix
-    return prefix
+    root: List[Any] = [{}, False]
+    for imp in split_imports:
+        node = root
+        for part in imp:
+            node = node[0].setdefault(part, [{}, False])
+        node[1] = True
+
+    canonical: Tuple[str, ...] = ()
+    node = root
+    # number of imports strictly below the current node
+    n_imports = len(split_imports)
+    while True:
+        # the common prefix of the imports below the current node
+        prefix: Tuple[str, ...] = ()
+        prefix_node = node
+        while len(prefix_node[0]) == 1:
+            ((part, prefix_node),) = prefix_node[0].items()
+            prefix += (part,)
+            if prefix_node[1]:
+                break
+
+        # descend into namespace packages, i.e. a single top-level name that is
+        # itself imported and is either known or has enough imports below it
+        if (
+            len(prefix) == 1
+            and prefix_node[1]
+            and (
+                n_imports > 3
+                or (
+                    (canonical or prefix)[0] in _NS_HEADS
+                    and canonical + prefix in KNOWN_NAMESPACE_PACKAGES
+                )
+            )
+        ):
+            canonical += prefix
+            node = prefix_node
+            n_imports -= 1
+        else:
+            return canonical + prefix
 
 
 def imports_to_canonical_import(imports: Set[str]) -> str:
@@ -170,18 +219,19 @@ def extract_single_pypi_information(meta_yaml: Dict[str, Any]) -> Optional[Mappi
     return None
 
 
+def _extract_node_pypi_information(node: str) -> Optional[Mapping]:
+    meta_yaml = load_node_meta_yaml(node)
+    if not meta_yaml:
+        return None
+    return extract_single_pypi_information(meta_yaml)
+
+
 def extract_pypi_information() -> List[Mapping]:
-    package_mappings: List[Mapping] = []
     nodes = get_all_keys_for_hashmap("node_attrs")
-    for node in nodes:
-        meta_yaml = load_node_meta_yaml(node)
-        if meta_yaml is None:
-            continue
-        if not meta_yaml:
-            continue
-        mapping = extract_single_pypi_information(meta_yaml)
-        if mapping is not None:
-            package_mappings.append(mapping)
+    # decoding the node attrs is CPU bound, so spread it over processes
+    with executor("process", max_workers=os.cpu_count() or 1) as pool:
+        mappings = pool.map(_extract_node_pypi_information, nodes, chunksize=128)
+        package_mappings: List[Mapping] = [m for m in mappings if m is not None]
 
     return package_mappings
 
@@ -273,23 +323,117 @@ def resolve_collisions(collisions: List[Mapping]) -> Mapping:
 def load_static_mappings() -> List[Mapping]:
     path = pathlib.Path(__file__).parent / "pypi_name_mapping_static.yaml"
     with path.open("r") as fp:
-        mapping = yaml.safe_load(fp)
+        mapping = yaml.load(fp, Loader=SafeLoader)
     for d in mapping:
         d["mapping_source"] = "static"
         d["pypi_name"] = canonicalize_pypi_name(d["pypi_name"])
     return mapping
 
 
-def chop(x: float) -> float:
-    """Chop the mantissa of a float to 20 bits.
+# number of low mantissa bits dropped by _chop_scores (52 - 20)
+_CHOP_BITS = 32
+_CHOP_HALF = 1 << (_CHOP_BITS - 1)
+_CHOP_MASK = ~((1 << _CHOP_BITS) - 1) & 0xFFFFFFFFFFFFFFFF
+
+
+def _chop_scores(scores: Dict[str, float]) -> Dict[str, float]:
+    """Chop the mantissas of all scores to 20 bits.
 
     This helps to alleviate floating point arithmetic errors when sorting by float keys.
+    The mantissas are rounded to nearest, ties to even, by masking their IEEE 754
+    representations.
     """
-    if isinstance(x, int):
-        return x
-    m, e = math.frexp(x)
-    m = round(m * (2 << 20)) / (2 << 20)
-    return m * 2**e
+    arr = np.fromiter(scores.values(), dtype=np.float64, count=len(scores))
+    bits = arr.view(np.uint64)
+    odd = (bits >> np.uint64(_CHOP_BITS)) & np.uint64(1)
+    chopped = (bits + np.uint64(_CHOP_HALF - 1) + odd) & np.uint64(_CHOP_MASK)
+    return dict(zip(scores, chopped.view(np.float64).tolist()))
+
+
+def _hits_cache_file(graph_file: str) -> Optional[str]:
+    """Get the path of the HITS cache for the current contents of the graph
+    file, or None if there is no graph file."""
+    if not os.path.exists(graph_file):
+        return None
+
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(graph_file, "rb") as fp:
+        for chunk in iter(lambda: fp.read(1 << 20), b""):
+            hasher.update(chunk)
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(graph_file)), ".cache")
+    return os.path.join(cache_dir, f"hits-{hasher.hexdigest()}.json")
+
+
+def _read_hits_cache(
+    cache_file: str,
+) -> Optional[Tuple[Dict[str, float], Dict[str, float]]]:
+    try:
+        with open(cache_file) as fp:
+            cached = json.load(fp)
+        return cached["hubs"], cached["authorities"]
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError, KeyError, TypeError) as e:
+        print(f"ignoring unreadable HITS cache {cache_file}: {e!r}")
+        return None
+
+
+def _write_hits_cache(
+    cache_file: str,
+    hubs: Dict[str, float],
+    authorities: Dict[str, float],
+) -> None:
+    """Atomically write the HITS cache and remove any stale ones."""
+    cache_dir, cache_name = os.path.split(cache_file)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_file = tempfile.mkstemp(dir=cache_dir, prefix=cache_name + ".")
+        try:
+            with os.fdopen(fd, "w") as fp:
+                json.dump({"hubs": hubs, "authorities": authorities}, fp)
+            os.replace(tmp_file, cache_file)
+        except BaseException:
+            os.unlink(tmp_file)
+            raise
+
+        for name in os.listdir(cache_dir):
+            if name.startswith("hits-") and name != cache_name:
+                os.unlink(os.path.join(cache_dir, name))
+    except OSError as e:
+        print(f"could not write HITS cache {cache_file}: {e!r}")
+
+
+def _hubs_and_authorities(
+    gx: "networkx.DiGraph",
+    graph_file: str,
+) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """Compute the HITS hubs and authorities of the graph.
+
+    The result is cached in a ``.cache`` directory next to the graph file,
+    keyed by the hash of its contents, so that reruns on an unchanged graph
+    skip the computation.
+    """
+    cache_file = _hits_cache_file(graph_file)
+    if cache_file is not None:
+        cached = _read_hits_cache(cache_file)
+        if cached is not None:
+            return cached
+
+    import networkx
+
+    # computes hubs and authorities.
+    # hubs are centralized sources (eg numpy)
+    # whilst authorities are packages with many edges to them.
+    hubs, authorities = networkx.hits(gx)
+
+    # Some hub/authority values are in the range +/- 1e-20. Clip these to 0.
+    # (There are no values between 1e-11 and 1e-19.)
+    hubs = {k: v if v > 1e-15 else 0 for k, v in hubs.items()}
+    authorities = {k: v if v > 1e-15 else 0 for k, v in authorities.items()}
+
+    if cache_file is not None:
+        _write_hits_cache(cache_file, hubs, authorities)
+    return hubs, authorities
 
 
 def determine_best_matches_for_pypi_import(
@@ -314,31 +458,25 @@ def determine_best_matches_for_pypi_import(
         if "file" in CF_TICK_GRAPH_DATA_BACKENDS and os.path.exists(
             IMPORT_TO_PKG_DIR_CLOBBERING
         ):
-            with open(IMPORT_TO_PKG_DIR_CLOBBERING) as fp:
+            with open(IMPORT_TO_PKG_DIR_CLOBBERING, "rb") as fp:
                 clobberers = loads(fp.read())
         else:
-            clobberers = loads(
-                requests.get(
-                    os.path.join(
-                        CF_TICK_GRAPH_GITHUB_BACKEND_BASE_URL,
-                        IMPORT_TO_PKG_DIR_CLOBBERING,
-                    )
-                ).text,
+            resp = _SESSION.get(
+                os.path.join(
+                    CF_TICK_GRAPH_GITHUB_BACKEND_BASE_URL,
+                    IMPORT_TO_PKG_DIR_CLOBBERING,
+                ),
+                timeout=30,
             )
+            resp.raise_for_status()
+            clobberers = loads(resp.content)
     except Exception as e:
         print(e)
         clobberers = set()
-    import networkx
-
-    # computes hubs and authorities.
-    # hubs are centralized sources (eg numpy)
-    # whilst authorities are packages with many edges to them.
-    hubs, authorities = networkx.hits(gx)
-
-    # Some hub/authority values are in the range +/- 1e-20. Clip these to 0.
-    # (There are no values between 1e-11 and 1e-19.)
-    hubs = {k: v if v > 1e-15 else 0 for k, v in hubs.items()}
-    authorities = {k: v if v > 1e-15 else 0 for k, v in authorities.items()}
+    hubs, authorities = _hubs_and_authorities(gx, graph_file)
+    # chop once per node instead of on every score evaluation
+    hubs = _chop_scores(hubs)
+    authorities = _chop_scores(authorities)
 
     mapping_src_weights = {
         "static": 1,
@@ -346,6 +484,7 @@ def determine_best_matches_for_pypi_import(
         "other": 3,
     }
 
+    @functools.cache
     def _score(conda_name, conda_name_is_feedstock_name=True, pkg_clobbers=False):
         """A higher score means less preferred"""
         mapping_src = map_by_conda_name.get(conda_name, {}).get(
@@ -358,14 +497,15 @@ def determine_best_matches_for_pypi_import(
             mapping_src_weight,
             int(pkg_clobbers),
             # A higher hub score means more centrality in the graph
-            -chop(hubs.get(conda_name, 0)),
+            -hubs.get(conda_name, 0),
             # A lower authority score means fewer dependencies
-            chop(authorities.get(conda_name, 0)),
+            authorities.get(conda_name, 0),
             # prefer pkgs that match feedstocks
             -int(conda_name_is_feedstock_name),
             conda_name,
         )
 
+    @functools.cache
     def score(pkg_name):
         """Base the score on
 
@@ -388,9 +528,18 @@ def determine_best_matches_for_pypi_import(
     with open(pathlib.Path(".") / "ranked_hubs_authorities.json", "w") as f:
         dump(ranked_list, f)
 
+    # positions in the global ranking, so that candidates found in the graph
+    # can be ordered by comparing ints instead of score tuples
+    rank = {pkg_name: i for i, pkg_name in enumerate(ranked_list)}
+
     for import_name, candidates in sorted(map_by_import_name.items()):
         conda_names = {c["conda_name"] for c in candidates}
-        ranked_conda_names = list(sorted(conda_names, key=score))
+        if len(conda_names) == 1:
+            ranked_conda_names = list(conda_names)
+        elif rank.keys() >= conda_names:
+            ranked_conda_names = sorted(conda_names, key=rank.__getitem__)
+        else:
+            ranked_conda_names = sorted(conda_names, key=score)
         winning_name = ranked_conda_names[0]
         if len(ranked_conda_names) > 1:
             print(
@@ -430,26 +579,29 @@ def main() -> None:
         static_packager_mappings,
     )
 
-    dirname = pathlib.Path(".") / "mappings" / "pypi"
-    dirname.mkdir(parents=True, exist_ok=True)
+    dirname = os.path.join("mappings", "pypi")
+    os.makedirs(dirname, exist_ok=True)
 
-    yaml_dump = functools.partial(yaml.dump, default_flow_style=False, sort_keys=True)
-    # import pdb; pdb.set_trace()
-    for dumper, suffix in ((yaml_dump, "yaml"), (json.dump, "json")):
-        with (dirname / f"grayskull_pypi_mapping.{suffix}").open("w") as fp:
-            dumper(grayskull_style, fp)
-
-        with (dirname / f"name_mapping.{suffix}").open("w") as fp:
-            dumper(
-                sorted(
-                    static_packager_mappings + pypi_package_mappings,
-                    key=lambda pkg: pkg["conda_name"],
-                ),
-                fp,
-            )
+    name_mapping = sorted(
+        static_packager_mappings + pypi_package_mappings,
+        key=lambda pkg: pkg["conda_name"],
+    )
+    import_name_priority_mapping = sorted(
+        ordered_import_names,
+        key=lambda entry: entry["import_name"],
+    )
 
-        with (dirname / f"import_name_priority_mapping.{suffix}").open("w") as fp:
-            dumper(
-                sorted(ordered_import_names, key=lambda entry: entry["import_name"]),
-                fp,
-            )
+    yaml_dump = functools.partial(
+        yaml.dump,
+        Dumper=SafeDumper,
+        default_flow_style=False,
+        sort_keys=True,
+    )
+    for dumper, suffix in ((yaml_dump, "yaml"), (json.dump, "json")):
+        for name, data in (
+            ("grayskull_pypi_mapping", grayskull_style),
+            ("name_mapping", name_mapping),
+            ("import_name_priority_mapping", import_name_priority_mapping),
+        ):
+            with open(os.path.join(dirname, f"{name}.{suffix}"), "w") as fp:
+                dumper(data, fp)
@@ -37,7 +37,13 @@ def update_build_number(raw_meta_yaml, new_build_number, build_patterns=None):
     if build_patterns is None:
         build_patterns = DEFAULT_BUILD_PATTERNS
 
+    normalized = False
     for p, n in build_patterns:
+        # a single scan of the whole text is much cheaper than matching
+        # every line and any line match is also a match here
+        if p.search(raw_meta_yaml) is None:
+            continue
+
         lines = raw_meta_yaml.splitlines()
         for i, line in enumerate(lines):
             m = p.match(line)
@@ -49,5 +55,9 @@ def update_build_number(raw_meta_yaml, new_build_number, build_patterns=None):
                     _new_build_number = new_build_number
                 lines[i] = m.group(1) + n.format(_new_build_number)
         raw_meta_yaml = "\n".join(lines) + "\n"
+        normalized = True
+
+    if not normalized:
+        raw_meta_yaml = "\n".join(raw_meta_yaml.splitlines()) + "\n"
 
     return raw_meta_yaml
@@ -1,6 +1,7 @@
 import os
 
 import pytest
+from container_utils import have_containers
 
 from conda_forge_tick import global_sensitive_env
 
@@ -40,14 +41,9 @@ def set_cf_tick_pytest_envvar():
 
 @pytest.fixture(autouse=True, scope="session")
 def turn_off_containers_if_missing():
-    import subprocess
-
-    ret = subprocess.run(["docker", "--version"], capture_output=True)
-    have_docker = ret.returncode == 0
-
     old_in_container = os.environ.get("CF_TICK_IN_CONTAINER")
 
-    if not have_docker:
+    if not have_containers():
         # tell the code we are in a container so that it
         # doesn't try to run docker commands
         os.environ["CF_TICK_IN_CONTAINER"] = "true"
@@ -0,0 +1,21 @@
+import functools
+import shutil
+import subprocess
+
+
+@functools.lru_cache(maxsize=1)
+def have_containers():
+    """Check whether docker is installed and its daemon is reachable."""
+    if shutil.which("docker") is None:
+        return False
+
+    try:
+        ret = subprocess.run(
+            ["docker", "info"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=10,
+        )
+    except subprocess.TimeoutExpired:
+        return False
+    return ret.returncode == 0
@@ -1,11 +1,13 @@
 import warnings
 from dataclasses import dataclass, field
+from itertools import chain, repeat
 from pathlib import Path
+from typing import Any, Callable
 
 import pytest
 from pydantic import TypeAdapter, ValidationError
 
-from conda_forge_tick.lazy_json_backends import get_sharded_path
+from conda_forge_tick.lazy_json_backends import FileLazyJsonBackend, get_sharded_path
 from conda_forge_tick.models.node_attributes import NodeAttributes
 from conda_forge_tick.models.pr_info import PrInfo
 from conda_forge_tick.models.pr_json import PullRequestData
@@ -113,6 +115,13 @@ class PerPackageModel:
     """
     If True, the feedstock must exist in the base_path directory.
     """
+    validate_json: Callable[[bytes], Any] = field(init=False, repr=False)
+    """
+    The validate_json method of the model's core schema validator, bound once.
+    """
+
+    def __post_init__(self):
+        self.validate_json = self.model.validator.validate_json
 
     @property
     def __name__(self):
@@ -132,9 +141,9 @@ PER_PACKAGE_MODELS: list[PerPackageModel] = [
 def get_all_feedstocks() -> set[str]:
     packages: set[str] = set()
 
+    backend = FileLazyJsonBackend()
     for model in PER_PACKAGE_MODELS:
-        for file in model.base_path.rglob("*.json"):
-            packages.add(file.stem)
+        packages.update(backend.hkeys(str(model.base_path)))
 
     return packages
 
@@ -161,11 +170,12 @@ def pytest_generate_tests(metafunc):
         )
 
     if "valid_feedstock" in metafunc.fixturenames:
-        parameters: list[tuple[PerPackageModel, str]] = []
-        for model in PER_PACKAGE_MODELS:
-            for package in packages:
-                if package not in model.bad_feedstocks:
-                    parameters.append((model, package))
+        parameters: list[tuple[PerPackageModel, str]] = list(
+            chain.from_iterable(
+                zip(repeat(model), packages - model.bad_feedstocks)
+                for model in PER_PACKAGE_MODELS
+            )
+        )
 
         metafunc.parametrize(
             "model,valid_feedstock",
@@ -174,11 +184,12 @@ def pytest_generate_tests(metafunc):
         return
 
     if "invalid_feedstock" in metafunc.fixturenames:
-        parameters: list[tuple[PerPackageModel, str]] = []
-        for model in PER_PACKAGE_MODELS:
-            for package in packages:
-                if package in model.bad_feedstocks:
-                    parameters.append((model, package))
+        parameters: list[tuple[PerPackageModel, str]] = list(
+            chain.from_iterable(
+                zip(repeat(model), packages & model.bad_feedstocks)
+                for model in PER_PACKAGE_MODELS
+            )
+        )
 
         metafunc.parametrize(
             "model,invalid_feedstock",
@@ -203,20 +214,20 @@ def pytest_generate_tests(metafunc):
 def test_model_valid(model: PerPackageModel, valid_feedstock: str):
     path = get_sharded_path(model.base_path / f"{valid_feedstock}.json")
     try:
-        with open(path) as f:
+        with open(path, "rb") as f:
             node_attrs = f.read()
     except FileNotFoundError:
         if model.must_exist:
             raise
         pytest.skip(f"{path} does not exist")
 
-    model.model.validate_json(node_attrs)
+    model.validate_json(node_attrs)
 
 
 def test_model_invalid(model: PerPackageModel, invalid_feedstock: str):
     path = get_sharded_path(model.base_path / f"{invalid_feedstock}.json")
     try:
-        with open(path) as f:
+        with open(path, "rb") as f:
             node_attrs = f.read()
     except FileNotFoundError:
         if model.must_exist:
@@ -224,7 +235,7 @@ def test_model_invalid(model: PerPackageModel, invalid_feedstock: str):
         pytest.skip(f"{path} does not exist")
 
     with pytest.raises(ValidationError):
-        model.model.validate_json(node_attrs)
+        model.validate_json(node_attrs)
 
 
 def test_validate_pr_json(pr_json: str):
@@ -3,15 +3,18 @@ import glob
 import os
 import subprocess
 import tempfile
+from types import MappingProxyType
 
 import conda_smithy
 import pytest
+from container_utils import have_containers
 
 from conda_forge_tick.feedstock_parser import load_feedstock_containerized
 from conda_forge_tick.lazy_json_backends import (
     LazyJson,
     dumps,
     lazy_json_override_backends,
+    loads,
 )
 from conda_forge_tick.os_utils import get_user_execute_permissions, pushd
 from conda_forge_tick.provide_source_code import provide_source_code_containerized
@@ -25,49 +28,52 @@ from conda_forge_tick.update_upstream_versions import (
 )
 from conda_forge_tick.utils import parse_meta_yaml_containerized, run_container_task
 
-HAVE_CONTAINERS = (
-    subprocess.run(["docker", "--version"], capture_output=True).returncode == 0
-)
-
-
-@pytest.mark.skipif(not HAVE_CONTAINERS, reason="containers not available")
-def test_container_tasks_get_latest_version():
-    data = run_container_task(
-        "get-latest-version",
-        ["--existing-feedstock-node-attrs", "conda-smithy"],
-    )
-    assert data["new_version"] == conda_smithy.__version__
+HAVE_CONTAINERS = have_containers()
 
 
-@pytest.mark.skipif(not HAVE_CONTAINERS, reason="containers not available")
-def test_container_tasks_get_latest_version_json():
+@pytest.fixture(scope="session")
+def conda_smithy_attrs():
+    """The conda-smithy node attrs, fetched once per session from GitHub, as
+    both a read-only view of the data and its dumped JSON blob."""
     with (
         tempfile.TemporaryDirectory() as tmpdir,
         pushd(tmpdir),
         lazy_json_override_backends(["github"], use_file_cache=False),
         LazyJson("node_attrs/conda-smithy.json") as lzj,
     ):
-        existing_feedstock_node_attrs = dumps(lzj.data)
+        return {"attrs": MappingProxyType(lzj.data), "dumped": dumps(lzj.data)}
+
+
+def _existing_feedstock_node_attrs(variant, conda_smithy_attrs):
+    """Get the --existing-feedstock-node-attrs value for conda-smithy and the
+    container input. The node attrs are passed by feedstock name or as JSON
+    on stdin."""
+    if variant == "name":
+        return "conda-smithy", None
+    else:
+        assert variant == "stdin"
+        return "-", conda_smithy_attrs["dumped"]
 
+
+@pytest.mark.skipif(not HAVE_CONTAINERS, reason="containers not available")
+@pytest.mark.parametrize("variant", ["name", "stdin"])
+def test_container_tasks_get_latest_version(variant, conda_smithy_attrs):
+    with tempfile.TemporaryDirectory() as tmpdir, pushd(tmpdir):
+        existing_feedstock_node_attrs, node_attrs_input = (
+            _existing_feedstock_node_attrs(variant, conda_smithy_attrs)
+        )
         data = run_container_task(
             "get-latest-version",
-            [
-                "--existing-feedstock-node-attrs",
-                existing_feedstock_node_attrs,
-            ],
+            ["--existing-feedstock-node-attrs", existing_feedstock_node_attrs],
+            input=node_attrs_input,
         )
         assert data["new_version"] == conda_smithy.__version__
 
 
 @pytest.mark.skipif(not HAVE_CONTAINERS, reason="containers not available")
-def test_get_latest_version_containerized():
-    with (
-        tempfile.TemporaryDirectory() as tmpdir,
-        pushd(tmpdir),
-        lazy_json_override_backends(["github"], use_file_cache=False),
-        LazyJson("node_attrs/conda-smithy.json") as lzj,
-    ):
-        attrs = copy.deepcopy(lzj.data)
+def test_get_latest_version_containerized(conda_smithy_attrs):
+    with tempfile.TemporaryDirectory() as tmpdir, pushd(tmpdir):
+        attrs = loads(conda_smithy_attrs["dumped"])
 
         data = get_latest_version_containerized(
             "conda-smithy", attrs, all_version_sources()
@@ -92,53 +98,28 @@ def test_get_latest_version_containerized_mpas_tools():
 
 
 @pytest.mark.skipif(not HAVE_CONTAINERS, reason="containers not available")
-def test_container_tasks_parse_feedstock():
+@pytest.mark.parametrize("variant", ["name", "stdin"])
+def test_container_tasks_parse_feedstock(variant, conda_smithy_attrs):
     with tempfile.TemporaryDirectory() as tmpdir, pushd(tmpdir):
-        data = run_container_task(
-            "parse-feedstock",
-            ["--existing-feedstock-node-attrs", "conda-smithy"],
+        existing_feedstock_node_attrs, node_attrs_input = (
+            _existing_feedstock_node_attrs(variant, conda_smithy_attrs)
         )
-
-        with (
-            lazy_json_override_backends(["github"], use_file_cache=False),
-            LazyJson("node_attrs/conda-smithy.json") as lzj,
-        ):
-            attrs = copy.deepcopy(lzj.data)
-
-        assert data["feedstock_name"] == attrs["feedstock_name"]
-        assert not data["parsing_error"]
-        assert data["raw_meta_yaml"] == attrs["raw_meta_yaml"]
-
-
-@pytest.mark.skipif(not HAVE_CONTAINERS, reason="containers not available")
-def test_container_tasks_parse_feedstock_json():
-    with (
-        tempfile.TemporaryDirectory() as tmpdir,
-        pushd(tmpdir),
-        lazy_json_override_backends(["github"], use_file_cache=False),
-        LazyJson("node_attrs/conda-smithy.json") as lzj,
-    ):
-        attrs = copy.deepcopy(lzj.data)
-        existing_feedstock_node_attrs = dumps(lzj.data)
-
         data = run_container_task(
             "parse-feedstock",
             ["--existing-feedstock-node-attrs", existing_feedstock_node_attrs],
+            input=node_attrs_input,
         )
+
+        attrs = conda_smithy_attrs["attrs"]
         assert data["feedstock_name"] == attrs["feedstock_name"]
         assert not data["parsing_error"]
         assert data["raw_meta_yaml"] == attrs["raw_meta_yaml"]
 
 
 @pytest.mark.skipif(not HAVE_CONTAINERS, reason="containers not available")
-def test_load_feedstock_containerized():
-    with (
-        tempfile.TemporaryDirectory() as tmpdir,
-        pushd(tmpdir),
-        lazy_json_override_backends(["github"], use_file_cache=False),
-        LazyJson("node_attrs/conda-smithy.json") as lzj,
-    ):
-        attrs = copy.deepcopy(lzj.data)
+def test_load_feedstock_containerized(conda_smithy_attrs):
+    with tempfile.TemporaryDirectory() as tmpdir, pushd(tmpdir):
+        attrs = loads(conda_smithy_attrs["dumped"])
 
         data = load_feedstock_containerized("conda-smithy", attrs)
         assert data["feedstock_name"] == attrs["feedstock_name"]
@@ -163,14 +144,9 @@ def test_load_feedstock_containerized_mpas_tools():
 
 
 @pytest.mark.skipif(not HAVE_CONTAINERS, reason="containers not available")
-def test_parse_meta_yaml_containerized():
-    with (
-        tempfile.TemporaryDirectory() as tmpdir,
-        pushd(tmpdir),
-        lazy_json_override_backends(["github"], use_file_cache=False),
-        LazyJson("node_attrs/conda-smithy.json") as lzj,
-    ):
-        attrs = copy.deepcopy(lzj.data)
+def test_parse_meta_yaml_containerized(conda_smithy_attrs):
+    with tempfile.TemporaryDirectory() as tmpdir, pushd(tmpdir):
+        attrs = conda_smithy_attrs["attrs"]
 
         data = parse_meta_yaml_containerized(
             attrs["raw_meta_yaml"],
@@ -13,9 +13,11 @@ import conda_forge_tick.utils
 from conda_forge_tick.lazy_json_backends import (
     CF_TICK_GRAPH_GITHUB_BACKEND_BASE_URL,
     LAZY_JSON_BACKENDS,
+    FileLazyJsonBackend,
     GithubLazyJsonBackend,
     LazyJson,
     MongoDBLazyJsonBackend,
+    _iter_json_files,
     dump,
     dumps,
     get_all_keys_for_hashmap,
@@ -372,6 +374,7 @@ def test_lazy_json_backends_dump_load(tmpdir):
         blob = {"c": "3333", "a": {1, 2, 3}, "b": 56, "d": LazyJson("blah.json")}
 
         assert blob == loads(dumps(blob))
+        assert blob == loads(dumps(blob).encode("utf-8"))
         assert (
             dumps(blob)
             == """\
@@ -510,6 +513,19 @@ def test_lazy_json(tmpdir, backend):
             )
 
 
+def test_lazy_json_load_data_str(tmpdir):
+    with pushd(str(tmpdir)):
+        lj = LazyJson("node_attrs/hi.json")
+        assert lj.load_data_str() == dumps({})
+
+        with lj as attrs:
+            attrs.update({"hi": "world", "s": {1, 2}})
+        assert LazyJson("node_attrs/hi.json").load_data_str() == dumps(
+            {"hi": "world", "s": {1, 2}}
+        )
+        assert loads(lj.load_data_str()) == lj.data
+
+
 def test_lazy_json_default(tmpdir):
     with pushd(str(tmpdir)):
         f = "hi.json"
@@ -601,6 +617,38 @@ def test_lazy_json_backends_hashmap(tmpdir):
         assert get_all_keys_for_hashmap("lazy_json") == []
 
 
+def test_iter_json_files(tmpdir):
+    with pushd(tmpdir):
+        for path in [
+            "node_attrs/a/b/c/foo.json",
+            "node_attrs/a/bar.json",
+            "node_attrs/baz.json",
+            "node_attrs/a/not_json.txt",
+            "node_attrs/.hidden.json",
+            "node_attrs/.git/a/hidden.json",
+        ]:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write("{}")
+        os.makedirs("node_attrs/empty/dir")
+        os.symlink(os.path.abspath("node_attrs/a"), "node_attrs/link")
+
+        assert sorted(_iter_json_files("node_attrs")) == sorted(
+            [
+                os.path.join("node_attrs", "a", "b", "c", "foo.json"),
+                os.path.join("node_attrs", "a", "bar.json"),
+                os.path.join("node_attrs", "baz.json"),
+            ]
+        )
+        assert sorted(FileLazyJsonBackend().hkeys("node_attrs")) == [
+            "bar",
+            "baz",
+            "foo",
+        ]
+        assert list(_iter_json_files("does_not_exist")) == []
+        assert FileLazyJsonBackend().hkeys("does_not_exist") == []
+
+
 def test_github_base_url() -> None:
     github_backend = GithubLazyJsonBackend()
     assert github_backend.base_url == CF_TICK_GRAPH_GITHUB_BACKEND_BASE_URL + "/"
@@ -1,8 +1,10 @@
+import datetime
 import os
 import re
 import subprocess
 import tempfile
 
+import dateutil.parser
 import networkx as nx
 import pytest
 
@@ -20,6 +22,7 @@ from conda_forge_tick.migrators import (
     Replacement,
     Version,
 )
+from conda_forge_tick.migrators.core import _parse_pr_timestamp
 
 # Legacy THINGS
 from conda_forge_tick.migrators.disabled.legacy import (
@@ -2023,3 +2026,51 @@ def test_generic_replacement(tmpdir):
         },
         tmpdir=tmpdir,
     )
+
+
+def test_migrator_filter_already_pred_bot_rerun():
+    m = Migrator()
+    attrs = {
+        "name": "foo",
+        "pr_info": {"PRed": [frozen_to_json_friendly(m.migrator_uid({}))]},
+    }
+    assert m.filter(attrs)
+
+    # the bot marks PRs for a rerun by editing the PRed entry in place
+    attrs["pr_info"]["PRed"][0]["data"]["bot_rerun"] = 1.0
+    assert not m.filter(attrs)
+
+
+@pytest.mark.parametrize(
+    "ts,expected,uses_dateutil",
+    [
+        (
+            "2024-01-02T03:04:05Z",
+            datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+            False,
+        ),
+        (
+            "2024-01-02T05:04:05+02:00",
+            datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+            False,
+        ),
+        (
+            "Tue, 02 Jan 2024 03:04:05 GMT",
+            datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+            True,
+        ),
+    ],
+)
+def test_parse_pr_timestamp(ts, expected, uses_dateutil, monkeypatch):
+    calls = []
+    parse = dateutil.parser.parse
+
+    def _parse(*args, **kwargs):
+        calls.append(args)
+        return parse(*args, **kwargs)
+
+    monkeypatch.setattr(dateutil.parser, "parse", _parse)
+    parsed = _parse_pr_timestamp(ts)
+    assert parsed == expected
+    assert parsed.utcoffset() is not None
+    assert bool(calls) is uses_dateutil
@@ -1,9 +1,20 @@
+import math
+import os
 import pathlib
+import random
 
+import networkx as nx
+import pytest
+
+from conda_forge_tick.lazy_json_backends import LazyJson, dumps
 from conda_forge_tick.os_utils import pushd
 from conda_forge_tick.pypi_name_mapping import (
+    _ARCHIVED_RE,
+    _chop_scores,
+    _hubs_and_authorities,
     extract_pypi_information,
     imports_to_canonical_import,
+    load_node_meta_yaml,
 )
 
 test_graph_dir = str(pathlib.Path(__file__).parent / "test_pypi_name_mapping")
@@ -60,3 +71,98 @@ def test_canonical_import_detection():
 
     assert imports_to_canonical_import(["a", "b"]) == ""
     assert imports_to_canonical_import(["a.b.c", "a.b.d"]) == "a.b"
+
+
+def _hits_graph(tmp_path):
+    gx = nx.DiGraph([("numpy", "scipy"), ("numpy", "pandas"), ("scipy", "pandas")])
+    graph_file = tmp_path / "graph.json"
+    graph_file.write_text('{"nodes": ["numpy", "scipy", "pandas"]}')
+    return gx, str(graph_file)
+
+
+def test_hubs_and_authorities_cache_hit(tmp_path, monkeypatch):
+    gx, graph_file = _hits_graph(tmp_path)
+    hubs, authorities = _hubs_and_authorities(gx, graph_file)
+    cache_files = os.listdir(tmp_path / ".cache")
+    assert len(cache_files) == 1 and cache_files[0].startswith("hits-")
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("HITS should not be recomputed")
+
+    monkeypatch.setattr(nx, "hits", _fail)
+    with pushd(str(tmp_path / ".cache")):
+        assert _hubs_and_authorities(gx, graph_file) == (hubs, authorities)
+
+    # a changed graph gets a new cache and the stale one is removed
+    monkeypatch.undo()
+    (tmp_path / "graph.json").write_text('{"nodes": []}')
+    _hubs_and_authorities(gx, graph_file)
+    new_cache_files = os.listdir(tmp_path / ".cache")
+    assert len(new_cache_files) == 1 and new_cache_files != cache_files
+
+
+@pytest.mark.parametrize("contents", ["", '{"hubs": {"numpy": 0.', "[]"])
+def test_hubs_and_authorities_cache_corrupt(tmp_path, contents):
+    gx, graph_file = _hits_graph(tmp_path)
+    hubs, authorities = _hubs_and_authorities(gx, graph_file)
+    (cache_file,) = (tmp_path / ".cache").iterdir()
+    cache_file.write_text(contents)
+
+    new_hubs, new_authorities = _hubs_and_authorities(gx, graph_file)
+    assert new_hubs == pytest.approx(hubs)
+    assert new_authorities == pytest.approx(authorities)
+    assert os.listdir(tmp_path / ".cache") == [cache_file.name]
+    with open(cache_file) as fp:
+        assert fp.read() != contents
+
+
+def _frexp_chop(x):
+    # the original scalar implementation of chopping to 20 mantissa bits
+    m, e = math.frexp(x)
+    m = round(m * (2 << 20)) / (2 << 20)
+    return m * 2**e
+
+
+def test_chop_scores():
+    ulp = 2.0**-20
+    vals = [0.0, -0.0, 1.0, 0.5, 0.3, -0.3, 1e-15, 0.1 + 0.2, 1.0 - 2.0**-53]
+    for base in [1.0, 1.0 + ulp, 0.75, 1.5 + 3 * ulp]:
+        # exact ties between two 20-bit mantissas, both odd and even
+        tie = base + ulp / 2
+        vals += [tie, -tie, math.nextafter(tie, 0), math.nextafter(tie, 2)]
+        vals += [tie * 2.0**-40, tie * 2.0**30]
+    rng = random.Random(42)
+    vals += [rng.random() * 10 ** rng.randint(-14, 0) for _ in range(1000)]
+
+    scores = {str(i): v for i, v in enumerate(vals)}
+    chopped = _chop_scores(scores)
+    assert list(chopped) == list(scores)
+    for k, v in scores.items():
+        assert chopped[k] == _frexp_chop(v), v
+
+
+@pytest.mark.parametrize(
+    "attrs,archived",
+    [
+        ({"archived": True}, True),
+        ({"archived": True, "meta_yaml": {"a": 1}, "name": "foo"}, True),
+        ({"a": 1, "archived": True}, True),
+        ({"archived": False, "meta_yaml": {"a": 1}}, False),
+        ({"meta_yaml": {"archived": True}}, False),
+        ({"meta_yaml": {"about": {"archived": True}}}, False),
+        ({"raw_meta_yaml": '\n "archived": true,\n'}, False),
+    ],
+)
+def test_archived_re_matches_dumps(attrs, archived):
+    # the regex is tied to the layout of the node attrs written by dumps
+    assert bool(_ARCHIVED_RE.search(dumps(attrs))) is archived
+
+
+def test_load_node_meta_yaml_archived(tmpdir):
+    with pushd(str(tmpdir)):
+        for name, archived in [("foo", True), ("bar", False)]:
+            with LazyJson(f"node_attrs/{name}.json") as attrs:
+                attrs.update({"archived": archived, "meta_yaml": {"a": name}})
+
+        assert load_node_meta_yaml("foo") is None
+        assert load_node_meta_yaml("bar") == {"a": "bar"}
@@ -0,0 +1,152 @@
+import pytest
+from test_migrators import run_test_migration
+
+from conda_forge_tick.migrators import Replacement
+from conda_forge_tick.migrators.core import _replacement_pattern
+
+MPL = Replacement(
+    old_pkg="matplotlib",
+    new_pkg="matplotlib-base",
+    rationale=(
+        "Unless you need `pyqt`, recipes should depend only on `matplotlib-base`."
+    ),
+    pr_limit=5,
+)
+
+sample_selectors = """\
+{% set version = "0.9" %}
+
+package:
+  name: viscm
+  version: {{ version }}
+
+source:
+  url: https://pypi.io/packages/source/v/viscm/viscm-{{ version }}.tar.gz
+  sha256: c770e4b76f726e653d2b7c2c73f71941a88de6eb47ccf8fb8e984b55562d05a2
+
+build:
+  number: 0
+  noarch: python
+
+requirements:
+  host:
+    - python
+    - pip
+  run:
+    - python
+    - matplotlib >=3.5  # [not win]
+    - matplotlib  # [win]
+    - matplotlib-inline
+    -   matplotlib   # the plotting library
+    - colorspacious
+
+test:
+  requires:
+    - matplotlib-base
+  imports:
+    - viscm
+"""
+
+sample_selectors_correct = """\
+{% set version = "0.9" %}
+
+package:
+  name: viscm
+  version: {{ version }}
+
+source:
+  url: https://pypi.io/packages/source/v/viscm/viscm-{{ version }}.tar.gz
+  sha256: c770e4b76f726e653d2b7c2c73f71941a88de6eb47ccf8fb8e984b55562d05a2
+
+build:
+  number: 1
+  noarch: python
+
+requirements:
+  host:
+    - python
+    - pip
+  run:
+    - python
+    - matplotlib-base >=3.5  # [not win]
+    - matplotlib-base  # [win]
+    - matplotlib-inline
+    -   matplotlib-base   # the plotting library
+    - colorspacious
+
+test:
+  requires:
+    - matplotlib-base
+  imports:
+    - viscm
+"""
+
+
+@pytest.mark.parametrize(
+    "line,match",
+    [
+        ("- foo", "foo"),
+        ("    - foo", "foo"),
+        ("    - foo >=1.0", "foo"),
+        ("    - foo  # [win]", "foo"),
+        ("    - foo-bar", "foo-bar"),
+        ("    - foo-bar 1.*  # [unix]", "foo-bar"),
+        ("    -\tfoo-bar\t# comment", "foo-bar"),
+        ("    - foobar", None),
+        ("    - foo-barbaz", None),
+        ("    - foo.bar", None),
+        ("    - bar", None),
+        ("    # - foo", None),
+        ("  run: foo", None),
+    ],
+)
+def test_replacement_pattern_multiple_packages(line, match):
+    pattern = _replacement_pattern({"foo", "foo-bar"})
+    m = pattern.search(line)
+    if match is None:
+        assert m is None
+    else:
+        assert m.group(1) == match
+
+
+def test_replacement_pattern_does_not_cross_lines():
+    pattern = _replacement_pattern({"foo", "foo-bar"})
+    text = "  -\n    foo\n  - bar\n  - foo-bar  # [osx]\n  - foo\n"
+    assert [m.group(1) for m in pattern.finditer(text)] == ["foo-bar", "foo"]
+
+
+def test_replacement_selectors_and_comments(tmpdir):
+    run_test_migration(
+        m=MPL,
+        inp=sample_selectors,
+        output=sample_selectors_correct,
+        kwargs={},
+        prb="I noticed that this recipe depends on `matplotlib` instead of ",
+        mr_out={
+            "migrator_name": "Replacement",
+            "migrator_version": MPL.migrator_version,
+            "name": "matplotlib-to-matplotlib-base",
+        },
+        tmpdir=tmpdir,
+    )
+
+
+def test_replacement_filter_no_old_pkg(tmpdir):
+    inp = sample_selectors
+    for line in (
+        "    - matplotlib >=3.5  # [not win]\n",
+        "    - matplotlib  # [win]\n",
+        "    -   matplotlib   # the plotting library\n",
+    ):
+        inp = inp.replace(line, "")
+    assert "- matplotlib-inline" in inp and "- matplotlib-base" in inp
+    run_test_migration(
+        m=MPL,
+        inp=inp,
+        output="",
+        kwargs={},
+        prb="",
+        mr_out={},
+        tmpdir=tmpdir,
+        should_filter=True,
+    )